@@ -0,0 +1,217 @@
+"""Persistent JavaScript for Automation (JXA) host for Calendar and Reminders."""
+
+import atexit
+import json
+import queue
+import subprocess
+import threading
+from collections import deque
+from collections.abc import Callable
+from typing import IO
+
+# How long to wait for a script to reply before killing the host. Calendar
+# queries on large calendars take a few seconds; anything far beyond that
+# means the host is wedged.
+_REPLY_TIMEOUT = 60.0
+
+# Trailing stderr lines kept for error messages when the host dies.
+_STDERR_LINES = 50
+
+# Runs inside osascript. Reads one JSON request per line from stdin and
+# writes one JSON reply per line to stdout. A request names a script by id
+# and carries its arguments; the first request for an id also carries the
+# function body, which is compiled once and kept for later calls. Each reply
+# echoes its request's seq number so a stray stdout line can never be taken
+# for the answer to a later request. Requests
+# are pure ASCII (json.dumps escapes everything else), so splitting stdin
+# on raw chunk boundaries is safe.
+_HOST_SCRIPT = r"""
+ObjC.import('Foundation');
+
+function run() {
+    const stdin = $.NSFileHandle.fileHandleWithStandardInput;
+    const stdout = $.NSFileHandle.fileHandleWithStandardOutput;
+    const compiled = {};
+    let pending = '';
+    for (;;) {
+        const data = stdin.availableData;
+        if (data.length === 0) {
+            return;
+        }
+        pending += $.NSString.alloc.initWithDataEncoding(data, $.NSUTF8StringEncoding).js;
+        let newline;
+        while ((newline = pending.indexOf('\n')) !== -1) {
+            const line = pending.slice(0, newline);
+            pending = pending.slice(newline + 1);
+            let seq = null;
+            let reply;
+            try {
+                const request = JSON.parse(line);
+                seq = request.seq;
+                if (request.script !== undefined) {
+                    compiled[request.id] = new Function('args', request.script);
+                }
+                const value = compiled[request.id](request.args);
+                reply = {seq: seq, ok: true, result: value == null ? '' : String(value)};
+            } catch (e) {
+                reply = {seq: seq, ok: false, error: String(e)};
+            }
+            const out = $(JSON.stringify(reply) + '\n');
+            stdout.writeData(out.dataUsingEncoding($.NSUTF8StringEncoding));
+        }
+    }
+}
+"""
+
+
+def _pump(stream: IO[str], put: Callable[[str], None]) -> None:
+    """Hand each line of stream to put until EOF, then put an empty string."""
+    try:
+        for line in stream:
+            put(line)
+    except (OSError, ValueError):
+        pass
+    put("")
+
+
+class _AppleScriptHost:
+    """A long-lived ``osascript`` process that evaluates JXA scripts.
+
+    Spawning ``osascript`` costs seconds per call, so a single process is
+    started on first use and fed scripts over stdin for the lifetime of the
+    server. Each distinct script is compiled once per process and then
+    invoked by id. Calls are serialized with a lock.
+
+    Background threads read the host's stdout and stderr so neither pipe
+    can fill up and block it; a host that stops replying is killed and
+    replaced on the next call.
+    """
+
+    def __init__(self):
+        self._proc: subprocess.Popen | None = None
+        self._lock = threading.Lock()
+        self._script_ids: dict[str, int] = {}
+        self._compiled: set[int] = set()
+        self._seq = 0
+        self._replies: queue.Queue[str] = queue.Queue()
+        self._stderr: deque[str] = deque(maxlen=_STDERR_LINES)
+        self._stderr_reader: threading.Thread | None = None
+
+    def _ensure_started(self) -> subprocess.Popen:
+        if self._proc is None or self._proc.poll() is not None:
+            self._stop()
+            self._compiled.clear()
+            self._proc = subprocess.Popen(
+                ["osascript", "-l", "JavaScript", "-e", _HOST_SCRIPT],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding="utf-8",
+            )
+            # Fresh sinks per process, so readers left over from a killed
+            # host cannot leak stale lines into the new one.
+            self._replies = queue.Queue()
+            self._stderr = deque(maxlen=_STDERR_LINES)
+            threading.Thread(
+                target=_pump, args=(self._proc.stdout, self._replies.put), daemon=True
+            ).start()
+            self._stderr_reader = threading.Thread(
+                target=_pump, args=(self._proc.stderr, self._stderr.append), daemon=True
+            )
+            self._stderr_reader.start()
+        return self._proc
+
+    def _stop(self, kill: bool = False) -> str:
+        """Shut down the host process and return the tail of its stderr."""
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return ""
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            if kill:
+                proc.kill()
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        if self._stderr_reader is not None:
+            self._stderr_reader.join(timeout=1)
+        return "".join(self._stderr).strip()
+
+    def start(self) -> None:
+        """Start the host process ahead of the first script, if needed."""
+        with self._lock:
+            self._ensure_started()
+
+    def run(self, script: str, **args) -> str:
+        """Evaluate a JXA function body and return its result as a string.
+
+        Args:
+            script: Body of a JavaScript function; its return value is the result
+            **args: JSON-serializable values available to the script as ``args``
+
+        Raises:
+            RuntimeError: If the script throws, the host process dies, or no
+                reply arrives within the timeout
+        """
+        with self._lock:
+            proc = self._ensure_started()
+            script_id = self._script_ids.setdefault(script, len(self._script_ids))
+            self._seq += 1
+            message = {"seq": self._seq, "id": script_id, "args": args}
+            if script_id not in self._compiled:
+                message["script"] = script
+            request = json.dumps(message) + "\n"
+            try:
+                proc.stdin.write(request)
+                proc.stdin.flush()
+            except OSError:
+                line = ""
+            else:
+                try:
+                    line = self._replies.get(timeout=_REPLY_TIMEOUT)
+                except queue.Empty:
+                    self._stop(kill=True)
+                    raise RuntimeError(
+                        f"JXA host did not reply within {_REPLY_TIMEOUT:g}s"
+                    ) from None
+            if not line:
+                stderr = self._stop()
+                raise RuntimeError(f"JXA host exited unexpectedly: {stderr}")
+            try:
+                reply = json.loads(line)
+            except ValueError:
+                reply = None
+            if not isinstance(reply, dict) or reply.get("seq") != self._seq:
+                # Replies are read in order, so after a stray line every later
+                # reply would be off by one; start over with a fresh host.
+                self._stop(kill=True)
+                raise RuntimeError(f"JXA host sent an unexpected reply: {line.strip()[:200]}")
+            if reply["ok"]:
+                self._compiled.add(script_id)
+        if not reply["ok"]:
+            raise RuntimeError(f"JXA error: {reply['error']}")
+        return reply["result"]
+
+    def close(self) -> None:
+        """Stop the host process if it is running."""
+        with self._lock:
+            self._stop()
+
+
+_host = _AppleScriptHost()
+atexit.register(_host.close)
+
+
+def start_host() -> None:
+    """Spawn the shared host process so the next script skips the startup cost."""
+    _host.start()
+
+
+def run_jxa(script: str, **args) -> str:
+    """Run a JXA function body in the shared host process."""
+    return _host.run(script, **args)
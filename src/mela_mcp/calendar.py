@@ -1,20 +1,76 @@
-"""AppleScript-based calendar integration for meal scheduling."""
-
-import subprocess
-import uuid
-from datetime import datetime, timedelta
+"""Apple Calendar integration for meal scheduling.
 
+Events are read and written through EventKit when PyObjC is installed and
+calendar access has been granted, and through the JXA host otherwise.
+"""
 
-def run_applescript(script: str) -> str:
-    """Execute an AppleScript and return the output."""
-    result = subprocess.run(
-        ["osascript", "-e", script],
-        capture_output=True,
-        text=True
-    )
-    if result.returncode != 0:
-        raise RuntimeError(f"AppleScript error: {result.stderr}")
-    return result.stdout.strip()
+import json
+import threading
+import time as _time
+import uuid
+from datetime import date as _date, datetime, timedelta
+
+from . import eventkit_store
+from .applescript_host import run_jxa, start_host
+
+# Upcoming meals are re-queried often within a session, so results are kept
+# briefly and dropped early when a meal is scheduled inside their window.
+_TTL = 30.0
+_sched_cache: dict[tuple[str, int, int], tuple[float, str, str, list[dict]]] = {}
+_sched_cache_lock = threading.Lock()
+
+_GET_EVENTS_JXA = r"""
+const app = Application('Calendar');
+const targetCalendar = app.calendars.byName(args.calendarName);
+
+const startDate = new Date();
+startDate.setHours(0, 0, 0, 0);
+startDate.setDate(startDate.getDate() - args.pastDays);
+const endDate = new Date(startDate);
+endDate.setDate(endDate.getDate() + args.pastDays + args.days);
+
+// Filter inside Calendar and fetch each property for all matches in one
+// Apple Event, rather than two round-trips per event.
+const matches = targetCalendar.events.whose({
+    _and: [
+        {startDate: {_greaterThanEquals: startDate}},
+        {startDate: {_lessThan: endDate}},
+    ],
+});
+const titles = matches.summary();
+const starts = matches.startDate();
+
+const pad = n => String(n).padStart(2, '0');
+return JSON.stringify(titles.map((title, i) => {
+    const start = starts[i];
+    return {
+        title: title,
+        date: `${start.getFullYear()}-${pad(start.getMonth() + 1)}-${pad(start.getDate())}`,
+        time: `${pad(start.getHours())}:${pad(start.getMinutes())}`,
+    };
+}));
+"""
+
+_SCHEDULE_EVENT_JXA = r"""
+const app = Application('Calendar');
+const targetCalendar = app.calendars.byName(args.calendarName);
+
+const eventDate = new Date(args.year, args.month - 1, args.day, args.hour, args.minute, 0);
+const endDate = new Date(eventDate.getTime() + 60 * 60 * 1000);
+
+const properties = {summary: args.title, startDate: eventDate, endDate: endDate};
+if (args.url !== null) {
+    properties.url = args.url;
+}
+targetCalendar.events.push(app.Event(properties));
+return 'success';
+"""
+
+
+def start() -> None:
+    """Prepare the calendar backend so the next request skips its startup cost."""
+    if not eventkit_store.available():
+        start_host()
 
 
 def get_scheduled_meals(calendar_name: str, days: int = 7, past_days: int = 0) -> list[dict]:
@@ -28,48 +84,47 @@ def get_scheduled_meals(calendar_name: str, days: int = 7, past_days: int = 0) -
     Returns:
         List of scheduled meals with title, date, time
     """
-    start_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-    end_date = start_date + timedelta(days=days)
-
-    script = f'''
-    set startDate to current date
-    set time of startDate to 0
-    set startDate to startDate - ({past_days} * days)
-    set endDate to startDate + ({past_days + days} * days)
-
-    set output to ""
-    tell application "Calendar"
-        set targetCalendar to first calendar whose name is "{calendar_name}"
-        set eventList to (every event of targetCalendar whose start date >= startDate and start date < endDate)
-        repeat with evt in eventList
-            set evtTitle to summary of evt
-            set evtStart to start date of evt
-            set dateStr to (year of evtStart as string) & "-" & text -2 thru -1 of ("0" & ((month of evtStart as number) as string)) & "-" & text -2 thru -1 of ("0" & (day of evtStart as string))
-            set timeStr to text -2 thru -1 of ("0" & (hours of evtStart as string)) & ":" & text -2 thru -1 of ("0" & (minutes of evtStart as string))
-            set output to output & evtTitle & "|||" & dateStr & "|||" & timeStr & "\\n"
-        end repeat
-    end tell
-    return output
-    '''
+    key = (calendar_name, days, past_days)
+    window_start = _date.today() - timedelta(days=past_days)
+    start = window_start.isoformat()
+    end = (window_start + timedelta(days=past_days + days)).isoformat()
+
+    with _sched_cache_lock:
+        cached = _sched_cache.get(key)
+    if cached is not None:
+        stamp, cached_start, _, meals = cached
+        if cached_start == start and _time.monotonic() - stamp < _TTL:
+            return [dict(m) for m in meals]
 
     try:
-        output = run_applescript(script)
+        if eventkit_store.available():
+            meals = eventkit_store.get_events(
+                calendar_name,
+                datetime.combine(window_start, datetime.min.time()),
+                datetime.fromisoformat(end),
+            )
+        else:
+            output = run_jxa(
+                _GET_EVENTS_JXA,
+                calendarName=calendar_name,
+                days=days,
+                pastDays=past_days,
+            )
+            meals = json.loads(output or "[]")
     except RuntimeError:
         return []
 
-    meals = []
-    if output:
-        for line in output.strip().split("\n"):
-            if line and "|||" in line:
-                parts = line.split("|||")
-                if len(parts) >= 3:
-                    meals.append({
-                        "title": parts[0],
-                        "date": parts[1],
-                        "time": parts[2]
-                    })
+    with _sched_cache_lock:
+        _sched_cache[key] = (_time.monotonic(), start, end, meals)
+    return [dict(m) for m in meals]
+
 
-    return meals
+def _invalidate_scheduled(calendar_name: str, date: str) -> None:
+    """Drop cached windows of calendar_name that contain date."""
+    with _sched_cache_lock:
+        for key, (_, start, end, _) in list(_sched_cache.items()):
+            if key[0] == calendar_name and start <= date < end:
+                del _sched_cache[key]
 
 
 def schedule_meal(calendar_name: str, title: str, date: str, time: str = "18:00", recipe_zid: str | None = None) -> dict:
@@ -85,37 +140,36 @@ def schedule_meal(calendar_name: str, title: str, date: str, time: str = "18:00"
     Returns:
         Dict with success status and event details
     """
-    year, month, day = date.split("-")
-    hour, minute = time.split(":")
+    try:
+        start_at = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M")
+    except ValueError:
+        return {
+            "success": False,
+            "error": f"Invalid date or time: {date} {time} (expected YYYY-MM-DD and HH:MM)"
+        }
 
-    url_property = ""
+    url = None
     if recipe_zid is not None:
         uid1 = str(uuid.uuid4()).upper()
         uid2 = str(uuid.uuid4()).upper()
-        url_property = f', url:"mela://calendar/{uid1}:{uid2}/{recipe_zid}"'
-
-    script = f'''
-    tell application "Calendar"
-        set targetCalendar to first calendar whose name is "{calendar_name}"
-
-        set eventDate to current date
-        set year of eventDate to {year}
-        set month of eventDate to {month}
-        set day of eventDate to {day}
-        set hours of eventDate to {hour}
-        set minutes of eventDate to {minute}
-        set seconds of eventDate to 0
-
-        set endDate to eventDate + (1 * hours)
-
-        set newEvent to make new event at end of events of targetCalendar with properties {{summary:"{title}", start date:eventDate, end date:endDate{url_property}}}
-
-        return "success"
-    end tell
-    '''
+        url = f"mela://calendar/{uid1}:{uid2}/{recipe_zid}"
 
     try:
-        result = run_applescript(script)
+        if eventkit_store.available():
+            eventkit_store.add_event(calendar_name, title, start_at, url)
+        else:
+            run_jxa(
+                _SCHEDULE_EVENT_JXA,
+                calendarName=calendar_name,
+                title=title,
+                year=start_at.year,
+                month=start_at.month,
+                day=start_at.day,
+                hour=start_at.hour,
+                minute=start_at.minute,
+                url=url,
+            )
+        _invalidate_scheduled(calendar_name, start_at.date().isoformat())
         return {
             "success": True,
             "title": title,
@@ -1,20 +1,62 @@
 """SQLite database access for Mela recipe database."""
 
+import atexit
+import re
 import sqlite3
+import threading
+from contextlib import closing
 from pathlib import Path
 
+from .pool import ConnectionPool, cache_per_version, fetch_dict, file_version, iter_dicts
+
 DB_PATH = Path.home() / "Library/Group Containers/66JC38RDUD.recipes.mela/Data/Curcuma.sqlite"
 
 
-def get_connection() -> sqlite3.Connection:
-    """Get a connection to the Mela database."""
+# One in-memory full-text index shared by every pooled connection, so a
+# change to Mela's database costs a single rebuild rather than one per
+# connection. Shared-cache tables lock per table, so the rebuild and the
+# queries that read the index are serialized.
+_SEARCH_INDEX_URI = "file:mela_mcp_search?mode=memory&cache=shared"
+_search_index_lock = threading.Lock()
+
+
+def _connect() -> sqlite3.Connection:
+    """Open a read-only connection to the Mela database."""
     if not DB_PATH.exists():
         raise FileNotFoundError(f"Mela database not found at {DB_PATH}")
-    conn = sqlite3.connect(DB_PATH, timeout=5.0)
-    conn.row_factory = sqlite3.Row
+    # Mela owns the database and may write to it while we are running, so
+    # open it read-only but not immutable.
+    conn = sqlite3.connect(
+        f"{DB_PATH.as_uri()}?mode=ro",
+        uri=True,
+        timeout=5.0,
+        check_same_thread=False,
+    )
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")
+    # Read pages through a memory map instead of read() syscalls.
+    conn.execute("PRAGMA mmap_size=268435456")
+    # Writable scratch space holding the shared full-text search index.
+    conn.execute("ATTACH DATABASE ? AS cache", (_SEARCH_INDEX_URI,))
     return conn
 
 
+_POOL = ConnectionPool(_connect)
+atexit.register(_POOL.close_all)
+
+# Borrow a pooled connection to the Mela database.
+borrow = _POOL.borrow
+
+
+def _data_version() -> tuple:
+    """Return a token that changes whenever Mela writes to its database.
+
+    Query results are cached per token, so edits made in the Mela app are
+    picked up on the next call without re-running queries in between.
+    """
+    return file_version(DB_PATH)
+
+
 def search_recipes(query: str) -> list[dict]:
     """Search recipes by name or ingredients.
 
@@ -24,25 +66,88 @@ def search_recipes(query: str) -> list[dict]:
     Returns:
         List of matching recipes with id, title, prep_time, cook_time, total_time
     """
-    conn = get_connection()
-    try:
-        cursor = conn.execute(
-            """
-            SELECT
-                Z_PK as id,
-                ZTITLE as title,
-                ZPREPTIME as prep_time,
-                ZCOOKTIME as cook_time,
-                ZTOTALTIME as total_time
-            FROM ZRECIPEOBJECT
-            WHERE ZTITLE LIKE ? OR ZINGREDIENTS LIKE ?
-            ORDER BY ZTITLE
-            """,
-            (f"%{query}%", f"%{query}%")
-        )
-        return [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
+    return [dict(row) for row in _search_recipes(query, _data_version())]
+
+
+def _ensure_search_index(conn: sqlite3.Connection, version: tuple) -> None:
+    """(Re)build the shared FTS5 index over recipe titles and ingredients.
+
+    The index records the data version it was built from, so it is rebuilt
+    once per change to the Mela database. Call with _search_index_lock held.
+    """
+    conn.execute("CREATE TABLE IF NOT EXISTS cache.recipes_fts_version (version TEXT)")
+    with closing(conn.execute("SELECT version FROM cache.recipes_fts_version")) as cursor:
+        row = cursor.fetchone()
+    if row is not None and row[0] == repr(version):
+        conn.commit()
+        return
+    conn.execute("DROP TABLE IF EXISTS cache.recipes_fts")
+    conn.execute(
+        "CREATE VIRTUAL TABLE cache.recipes_fts USING fts5(title, ingredients, content='')"
+    )
+    conn.execute(
+        """
+        INSERT INTO cache.recipes_fts (rowid, title, ingredients)
+        SELECT Z_PK, ZTITLE, ZINGREDIENTS FROM ZRECIPEOBJECT
+        """
+    )
+    conn.execute("DELETE FROM cache.recipes_fts_version")
+    conn.execute("INSERT INTO cache.recipes_fts_version VALUES (?)", (repr(version),))
+    conn.commit()
+
+
+def _fts_query(query: str) -> str | None:
+    """Turn a free-text query into an FTS5 expression of prefix terms."""
+    terms = re.findall(r"\w+", query)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+@cache_per_version()
+def _search_recipes(query: str, version: tuple) -> tuple[dict, ...]:
+    match = _fts_query(query)
+    with borrow() as conn:
+        if match is not None:
+            with _search_index_lock:
+                try:
+                    _ensure_search_index(conn, version)
+                except sqlite3.OperationalError:
+                    # SQLite built without FTS5; fall back to scanning below.
+                    conn.rollback()
+                else:
+                    with closing(conn.execute(
+                            """
+                            SELECT
+                                r.Z_PK as id,
+                                r.ZTITLE as title,
+                                r.ZPREPTIME as prep_time,
+                                r.ZCOOKTIME as cook_time,
+                                r.ZTOTALTIME as total_time
+                            FROM cache.recipes_fts
+                            JOIN ZRECIPEOBJECT r ON r.Z_PK = recipes_fts.rowid
+                            WHERE recipes_fts MATCH ?
+                            ORDER BY bm25(recipes_fts), r.ZTITLE
+                            """,
+                            (match,)
+                        )) as cursor:
+                        return tuple(iter_dicts(cursor))
+
+        with closing(conn.execute(
+                """
+                SELECT
+                    Z_PK as id,
+                    ZTITLE as title,
+                    ZPREPTIME as prep_time,
+                    ZCOOKTIME as cook_time,
+                    ZTOTALTIME as total_time
+                FROM ZRECIPEOBJECT
+                WHERE ZTITLE LIKE ? OR ZINGREDIENTS LIKE ?
+                ORDER BY ZTITLE
+                """,
+                (f"%{query}%", f"%{query}%")
+            )) as cursor:
+            return tuple(iter_dicts(cursor))
 
 
 def get_recipe(recipe_id: int) -> dict | None:
@@ -54,38 +159,40 @@ def get_recipe(recipe_id: int) -> dict | None:
     Returns:
         Full recipe details or None if not found
     """
-    conn = get_connection()
-    try:
-        cursor = conn.execute(
-            """
-            SELECT
-                Z_PK as id,
-                ZTITLE as title,
-                ZINGREDIENTS as ingredients,
-                ZINSTRUCTIONS as instructions,
-                ZNOTES as notes,
-                ZNUTRITION as nutrition,
-                ZYIELD as yield,
-                ZPREPTIME as prep_time,
-                ZCOOKTIME as cook_time,
-                ZTOTALTIME as total_time,
-                ZFAVORITE as favorite,
-                ZWANTTOCOOK as want_to_cook,
-                ZLINK as link
-            FROM ZRECIPEOBJECT
-            WHERE Z_PK = ?
-            """,
-            (recipe_id,)
-        )
-        row = cursor.fetchone()
-        if row:
-            result = dict(row)
+    result = _get_recipe(recipe_id, _data_version())
+    return dict(result) if result is not None else None
+
+
+@cache_per_version()
+def _get_recipe(recipe_id: int, version: tuple) -> dict | None:
+    with borrow() as conn:
+        with closing(conn.execute(
+                """
+                SELECT
+                    Z_PK as id,
+                    ZTITLE as title,
+                    ZINGREDIENTS as ingredients,
+                    ZINSTRUCTIONS as instructions,
+                    ZNOTES as notes,
+                    ZNUTRITION as nutrition,
+                    ZYIELD as yield,
+                    ZPREPTIME as prep_time,
+                    ZCOOKTIME as cook_time,
+                    ZTOTALTIME as total_time,
+                    ZFAVORITE as favorite,
+                    ZWANTTOCOOK as want_to_cook,
+                    ZLINK as link
+                FROM ZRECIPEOBJECT
+                WHERE Z_PK = ?
+                """,
+                (recipe_id,)
+            )) as cursor:
+            result = fetch_dict(cursor)
+        if result:
             result["favorite"] = bool(result["favorite"])
             result["want_to_cook"] = bool(result["want_to_cook"])
             return result
         return None
-    finally:
-        conn.close()
 
 
 def get_recipe_zid(recipe_id: int) -> str | None:
@@ -97,16 +204,47 @@ def get_recipe_zid(recipe_id: int) -> str | None:
     Returns:
         The ZID string or None if not found
     """
-    conn = get_connection()
-    try:
-        cursor = conn.execute(
-            "SELECT ZID FROM ZRECIPEOBJECT WHERE Z_PK = ?",
-            (recipe_id,)
-        )
-        row = cursor.fetchone()
-        return row["ZID"] if row else None
-    finally:
-        conn.close()
+    return _get_recipe_zid(recipe_id, _data_version())
+
+
+@cache_per_version()
+def _get_recipe_zid(recipe_id: int, version: tuple) -> str | None:
+    with borrow() as conn:
+        with closing(conn.execute(
+                "SELECT ZID FROM ZRECIPEOBJECT WHERE Z_PK = ?",
+                (recipe_id,)
+            )) as cursor:
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+
+def find_recipe_by_title(title: str) -> dict | None:
+    """Find the recipe whose title matches exactly, ignoring (ASCII) case.
+
+    Args:
+        title: Recipe title to look up
+
+    Returns:
+        Dict with id and zid, or None if no recipe has that title
+    """
+    result = _find_recipe_by_title(title, _data_version())
+    return dict(result) if result is not None else None
+
+
+@cache_per_version()
+def _find_recipe_by_title(title: str, version: tuple) -> dict | None:
+    with borrow() as conn:
+        with closing(conn.execute(
+                """
+                SELECT Z_PK as id, ZID as zid
+                FROM ZRECIPEOBJECT
+                WHERE ZTITLE = ? COLLATE NOCASE
+                ORDER BY Z_PK
+                LIMIT 1
+                """,
+                (title,)
+            )) as cursor:
+            return fetch_dict(cursor)
 
 
 def get_ingredients_for_scheduled_meals(meal_titles: list[str]) -> list[dict]:
@@ -122,35 +260,34 @@ def get_ingredients_for_scheduled_meals(meal_titles: list[str]) -> list[dict]:
         List of dicts with title, ingredients (raw text or None),
         and matched (True, "fuzzy", or False)
     """
-    conn = get_connection()
-    try:
+    with borrow() as conn:
         results = []
         for title in meal_titles:
             # Try exact case-insensitive match first
-            cursor = conn.execute(
-                "SELECT ZTITLE, ZINGREDIENTS FROM ZRECIPEOBJECT WHERE ZTITLE COLLATE NOCASE = ?",
-                (title,)
-            )
-            row = cursor.fetchone()
+            with closing(conn.execute(
+                    "SELECT ZTITLE, ZINGREDIENTS FROM ZRECIPEOBJECT WHERE ZTITLE COLLATE NOCASE = ?",
+                    (title,)
+                )) as cursor:
+                row = cursor.fetchone()
             if row:
                 results.append({
                     "title": title,
-                    "ingredients": row["ZINGREDIENTS"],
+                    "ingredients": row[1],
                     "matched": True,
                 })
                 continue
 
             # Fallback: LIKE match
-            cursor = conn.execute(
-                "SELECT ZTITLE, ZINGREDIENTS FROM ZRECIPEOBJECT WHERE ZTITLE LIKE ? LIMIT 1",
-                (f"%{title}%",)
-            )
-            row = cursor.fetchone()
+            with closing(conn.execute(
+                    "SELECT ZTITLE, ZINGREDIENTS FROM ZRECIPEOBJECT WHERE ZTITLE LIKE ? LIMIT 1",
+                    (f"%{title}%",)
+                )) as cursor:
+                row = cursor.fetchone()
             if row:
                 results.append({
                     "title": title,
-                    "recipe_title": row["ZTITLE"],
-                    "ingredients": row["ZINGREDIENTS"],
+                    "recipe_title": row[0],
+                    "ingredients": row[1],
                     "matched": "fuzzy",
                 })
                 continue
@@ -162,8 +299,6 @@ def get_ingredients_for_scheduled_meals(meal_titles: list[str]) -> list[dict]:
             })
 
         return results
-    finally:
-        conn.close()
 
 
 def list_recipes(filter: str = "all") -> list[dict]:
@@ -175,8 +310,12 @@ def list_recipes(filter: str = "all") -> list[dict]:
     Returns:
         List of recipes with id, title, favorite, want_to_cook
     """
-    conn = get_connection()
-    try:
+    return [dict(row) for row in _list_recipes(filter, _data_version())]
+
+
+@cache_per_version()
+def _list_recipes(filter: str, version: tuple) -> tuple[dict, ...]:
+    with borrow() as conn:
         base_query = """
             SELECT
                 Z_PK as id,
@@ -193,13 +332,21 @@ def list_recipes(filter: str = "all") -> list[dict]:
         else:
             query = base_query + " ORDER BY ZTITLE"
 
-        cursor = conn.execute(query)
-        results = []
-        for row in cursor.fetchall():
-            result = dict(row)
-            result["favorite"] = bool(result["favorite"])
-            result["want_to_cook"] = bool(result["want_to_cook"])
-            results.append(result)
-        return results
-    finally:
-        conn.close()
+        with closing(conn.execute(query)) as cursor:
+            return tuple(
+                {
+                    "id": id,
+                    "title": title,
+                    "favorite": bool(favorite),
+                    "want_to_cook": bool(want_to_cook),
+                }
+                for id, title, favorite, want_to_cook in cursor
+            )
+
+
+def warm_cache() -> None:
+    """Pre-populate the cache with the most commonly requested listing."""
+    try:
+        list_recipes("favorites")
+    except (FileNotFoundError, sqlite3.Error):
+        pass
@@ -0,0 +1,149 @@
+"""Direct EventKit access to Apple Calendar through PyObjC, when installed."""
+
+import threading
+from datetime import datetime, timedelta
+
+try:
+    import EventKit
+    import Foundation
+except ImportError:  # PyObjC missing or not on macOS; callers fall back to JXA.
+    EventKit = None
+    Foundation = None
+
+# How long to wait for the user to answer the calendar access prompt.
+_ACCESS_TIMEOUT = 60.0
+
+
+class _EventStore:
+    """A single ``EKEventStore`` shared for the lifetime of the server.
+
+    Access is requested once, on first use. Until the user answers, and for
+    good if PyObjC is unavailable or access is denied, ``available()``
+    reports False and callers should use the JXA host instead. EventKit
+    calls are serialized with a lock that the access request never holds.
+    """
+
+    def __init__(self):
+        self._store = None
+        # None until EventKit reports a definite grant (True) or denial (False).
+        self._granted: bool | None = None
+        self._requested: threading.Event | None = None
+        self._access_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+    def _request_access(self) -> tuple[threading.Event, bool]:
+        """Send the access request unless one is already pending.
+
+        Returns the event set once EventKit answers, and whether this call
+        sent the request.
+        """
+        with self._access_lock:
+            if self._requested is not None:
+                return self._requested, False
+            done = self._requested = threading.Event()
+            store = EventKit.EKEventStore.alloc().init()
+
+        def completion(ok, error):
+            with self._access_lock:
+                if ok:
+                    self._store = store
+                self._granted = bool(ok)
+            done.set()
+
+        # macOS 14 split calendar access into full and write-only; the old
+        # request method no longer grants read access there.
+        if hasattr(store, "requestFullAccessToEventsWithCompletion_"):
+            store.requestFullAccessToEventsWithCompletion_(completion)
+        else:
+            store.requestAccessToEntityType_completion_(EventKit.EKEntityTypeEvent, completion)
+        return done, True
+
+    def _calendar(self, calendar_name: str):
+        for cal in self._store.calendarsForEntityType_(EventKit.EKEntityTypeEvent):
+            if cal.title() == calendar_name:
+                return cal
+        raise RuntimeError(f"Calendar not found: {calendar_name}")
+
+    def available(self) -> bool:
+        """Request access if needed; True once EventKit access is granted.
+
+        Only the call that sends the request waits for the user's answer, and
+        only up to _ACCESS_TIMEOUT. Calls made while the answer is pending
+        return False, and a later grant takes effect on the next call.
+        """
+        if EventKit is None:
+            return False
+        if self._granted is None:
+            done, sent = self._request_access()
+            if sent:
+                done.wait(_ACCESS_TIMEOUT)
+        return bool(self._granted)
+
+    def get_events(self, calendar_name: str, start: datetime, end: datetime) -> list[dict]:
+        """Return events starting in [start, end) as dicts with title, date, time.
+
+        Raises:
+            RuntimeError: If the calendar does not exist
+        """
+        with self._lock:
+            cal = self._calendar(calendar_name)
+            predicate = self._store.predicateForEventsWithStartDate_endDate_calendars_(
+                _nsdate(start), _nsdate(end), [cal]
+            )
+            starts = [
+                (datetime.fromtimestamp(event.startDate().timeIntervalSince1970()), event.title())
+                for event in self._store.eventsMatchingPredicate_(predicate)
+            ]
+        # The predicate matches events overlapping the range; keep only those
+        # that start inside it.
+        return [
+            {
+                "title": str(title),
+                "date": when.strftime("%Y-%m-%d"),
+                "time": when.strftime("%H:%M"),
+            }
+            for when, title in sorted(starts, key=lambda item: item[0])
+            if start <= when < end
+        ]
+
+    def add_event(self, calendar_name: str, title: str, start: datetime, url: str | None = None) -> None:
+        """Save a one-hour event to the named calendar.
+
+        Raises:
+            RuntimeError: If the calendar does not exist or the save fails
+        """
+        with self._lock:
+            event = EventKit.EKEvent.eventWithEventStore_(self._store)
+            event.setTitle_(title)
+            event.setStartDate_(_nsdate(start))
+            event.setEndDate_(_nsdate(start + timedelta(hours=1)))
+            event.setCalendar_(self._calendar(calendar_name))
+            if url is not None:
+                event.setURL_(Foundation.NSURL.URLWithString_(url))
+            ok, error = self._store.saveEvent_span_commit_error_(
+                event, EventKit.EKSpanThisEvent, True, None
+            )
+        if not ok:
+            raise RuntimeError(f"EventKit error: {error.localizedDescription() if error else 'save failed'}")
+
+
+def _nsdate(value: datetime):
+    return Foundation.NSDate.dateWithTimeIntervalSince1970_(value.timestamp())
+
+
+_store = _EventStore()
+
+
+def available() -> bool:
+    """Whether calendar requests can go through EventKit instead of JXA."""
+    return _store.available()
+
+
+def get_events(calendar_name: str, start: datetime, end: datetime) -> list[dict]:
+    """Return events from the shared store; see ``_EventStore.get_events``."""
+    return _store.get_events(calendar_name, start, end)
+
+
+def add_event(calendar_name: str, title: str, start: datetime, url: str | None = None) -> None:
+    """Save an event through the shared store; see ``_EventStore.add_event``."""
+    _store.add_event(calendar_name, title, start, url)
@@ -1,22 +1,78 @@
 """SQLite database for meal logging and history tracking."""
 
+import atexit
 import os
 import sqlite3
+import threading
+from contextlib import closing
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from .pool import ConnectionPool, cache_per_version, fetch_dict, fetch_dicts, file_version, iter_dicts
+
 DEFAULT_DB_PATH = Path.home() / ".mela-mcp" / "meal_log.db"
 DB_PATH = Path(os.environ.get("MELA_MEAL_LOG_PATH", str(DEFAULT_DB_PATH)))
 
+# INSERT/UPDATE ... RETURNING needs SQLite 3.35+.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35)
+
+# Bumped on every write made here. The database file stamps catch writes
+# from other server instances; the counter catches ours even when they land
+# within the same mtime tick.
+_write_count = 0
+_write_count_lock = threading.Lock()
+
+
+def _connect() -> sqlite3.Connection:
+    """Open a connection to the meal log database."""
+    conn = sqlite3.connect(DB_PATH, timeout=5.0, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")
+    # Keep dirty pages in the page cache until commit and read the file
+    # through a memory map instead of read() syscalls.
+    conn.execute("PRAGMA cache_spill=OFF")
+    conn.execute("PRAGMA mmap_size=268435456")
+    return conn
+
+
+def _optimize(conn: sqlite3.Connection) -> None:
+    """Let SQLite refresh planner statistics before a connection closes."""
+    conn.execute("PRAGMA optimize")
+
+
+_POOL = ConnectionPool(_connect, on_close=_optimize)
+atexit.register(_POOL.close_all)
+
+# Borrow a pooled connection to the meal log database.
+borrow = _POOL.borrow
+
+
+def _invalidate_cache() -> None:
+    global _write_count
+    with _write_count_lock:
+        _write_count += 1
+
+
+def _data_version() -> tuple:
+    """Return a token that changes whenever the meal log is written.
+
+    The meal log is shared by every server instance, so cached query results
+    are keyed on this rather than on local writes alone.
+    """
+    return (_write_count, *file_version(DB_PATH))
+
 
 def init_db(db_path: Path | None = None) -> None:
     """Create the meals table if it doesn't exist."""
     global DB_PATH
     if db_path is not None:
         DB_PATH = db_path
+        _POOL.close_all()
+        _invalidate_cache()
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
-    try:
+    with borrow() as conn:
         conn.execute("""
             CREATE TABLE IF NOT EXISTS meals (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -31,16 +87,24 @@ def init_db(db_path: Path | None = None) -> None:
                 updated_at TEXT NOT NULL
             )
         """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_meals_date ON meals(date)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_meals_status_date ON meals(status, date)")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_meals_recipe_title ON meals(COALESCE(recipe_id, title), date)"
+        )
+        with closing(conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+            )) as cursor:
+            analyzed = cursor.fetchone()
+        if analyzed is None:
+            conn.execute("ANALYZE")
         conn.commit()
-    finally:
-        conn.close()
 
 
-def get_connection() -> sqlite3.Connection:
-    """Get a connection to the meal log database."""
-    conn = sqlite3.connect(DB_PATH, timeout=5.0)
-    conn.row_factory = sqlite3.Row
-    return conn
+_INSERT_MEAL_SQL = """
+    INSERT INTO meals (date, title, recipe_id, tags, status, portions, notes, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
 
 
 def log_meal(
@@ -54,20 +118,56 @@ def log_meal(
 ) -> dict:
     """Insert a meal log entry and return the new row as a dict."""
     now = datetime.now().isoformat()
-    conn = get_connection()
-    try:
-        cursor = conn.execute(
-            """
-            INSERT INTO meals (date, title, recipe_id, tags, status, portions, notes, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (date, title, recipe_id, tags, status, portions, notes, now, now),
+    params = (date, title, recipe_id, tags, status, portions, notes, now, now)
+    with borrow() as conn:
+        if _HAS_RETURNING:
+            with closing(conn.execute(_INSERT_MEAL_SQL + " RETURNING *", params)) as cursor:
+                row = fetch_dict(cursor)
+            conn.commit()
+        else:
+            with closing(conn.execute(_INSERT_MEAL_SQL, params)) as cursor:
+                meal_id = cursor.lastrowid
+            conn.commit()
+            with closing(conn.execute("SELECT * FROM meals WHERE id = ?", (meal_id,))) as cursor:
+                row = fetch_dict(cursor)
+        _invalidate_cache()
+        return row
+
+
+def log_meals_bulk(meals: list[dict]) -> list[dict]:
+    """Insert several meal log entries in one transaction.
+
+    Each dict needs date and title, and may carry recipe_id, tags, status
+    (default "cooked"), portions and notes. Returns the new rows in order.
+    """
+    now = datetime.now().isoformat()
+    params = [
+        (
+            m["date"],
+            m["title"],
+            m.get("recipe_id"),
+            m.get("tags"),
+            m.get("status", "cooked"),
+            m.get("portions"),
+            m.get("notes"),
+            now,
+            now,
         )
+        for m in meals
+    ]
+    if not params:
+        return []
+    with borrow() as conn:
+        # Take the write lock up front so the new ids follow last_id.
+        conn.execute("BEGIN IMMEDIATE")
+        with closing(conn.execute("SELECT COALESCE(MAX(id), 0) FROM meals")) as cursor:
+            last_id = cursor.fetchone()[0]
+        conn.executemany(_INSERT_MEAL_SQL, params)
+        with closing(conn.execute("SELECT * FROM meals WHERE id > ? ORDER BY id", (last_id,))) as cursor:
+            rows = fetch_dicts(cursor)
         conn.commit()
-        row = conn.execute("SELECT * FROM meals WHERE id = ?", (cursor.lastrowid,)).fetchone()
-        return dict(row)
-    finally:
-        conn.close()
+        _invalidate_cache()
+        return rows
 
 
 def update_meal(meal_id: int, **kwargs) -> dict:
@@ -78,29 +178,32 @@ def update_meal(meal_id: int, **kwargs) -> dict:
     allowed = {"date", "title", "recipe_id", "tags", "status", "portions", "notes"}
     fields = {k: v for k, v in kwargs.items() if k in allowed and v is not None}
     if not fields:
-        conn = get_connection()
-        try:
-            row = conn.execute("SELECT * FROM meals WHERE id = ?", (meal_id,)).fetchone()
+        with borrow() as conn:
+            with closing(conn.execute("SELECT * FROM meals WHERE id = ?", (meal_id,))) as cursor:
+                row = fetch_dict(cursor)
             if row is None:
                 raise ValueError(f"No meal with id {meal_id}")
-            return dict(row)
-        finally:
-            conn.close()
+            return row
 
     fields["updated_at"] = datetime.now().isoformat()
     set_clause = ", ".join(f"{k} = ?" for k in fields)
     values = list(fields.values()) + [meal_id]
 
-    conn = get_connection()
-    try:
-        conn.execute(f"UPDATE meals SET {set_clause} WHERE id = ?", values)
-        conn.commit()
-        row = conn.execute("SELECT * FROM meals WHERE id = ?", (meal_id,)).fetchone()
+    sql = f"UPDATE meals SET {set_clause} WHERE id = ?"
+    with borrow() as conn:
+        if _HAS_RETURNING:
+            with closing(conn.execute(sql + " RETURNING *", values)) as cursor:
+                row = fetch_dict(cursor)
+            conn.commit()
+        else:
+            conn.execute(sql, values)
+            conn.commit()
+            with closing(conn.execute("SELECT * FROM meals WHERE id = ?", (meal_id,))) as cursor:
+                row = fetch_dict(cursor)
+        _invalidate_cache()
         if row is None:
             raise ValueError(f"No meal with id {meal_id}")
-        return dict(row)
-    finally:
-        conn.close()
+        return row
 
 
 def get_meals(
@@ -110,6 +213,18 @@ def get_meals(
     tags: str | None = None,
 ) -> list[dict]:
     """Query meals with optional filters."""
+    rows = _get_meals(start_date, end_date, status, tags, _data_version())
+    return [dict(row) for row in rows]
+
+
+@cache_per_version()
+def _get_meals(
+    start_date: str | None,
+    end_date: str | None,
+    status: str | None,
+    tags: str | None,
+    version: tuple,
+) -> tuple[dict, ...]:
     conditions = []
     params: list = []
 
@@ -131,47 +246,65 @@ def get_meals(
     if conditions:
         where = "WHERE " + " AND ".join(conditions)
 
-    conn = get_connection()
-    try:
-        cursor = conn.execute(f"SELECT * FROM meals {where} ORDER BY date DESC", params)
-        return [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
+    with borrow() as conn:
+        with closing(conn.execute(f"SELECT * FROM meals {where} ORDER BY date DESC", params)) as cursor:
+            return tuple(iter_dicts(cursor))
 
 
 def get_unreconciled(days: int = 7) -> list[dict]:
     """Get meals with status 'planned' in the last N days."""
     cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
     today = datetime.now().strftime("%Y-%m-%d")
-    conn = get_connection()
-    try:
-        cursor = conn.execute(
-            "SELECT * FROM meals WHERE status = 'planned' AND date >= ? AND date <= ? ORDER BY date",
-            (cutoff, today),
-        )
-        return [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
+    with borrow() as conn:
+        with closing(conn.execute(
+                "SELECT * FROM meals WHERE status = 'planned' AND date >= ? AND date <= ? ORDER BY date",
+                (cutoff, today),
+            )) as cursor:
+            return fetch_dicts(cursor)
+
+
+# Split the comma-separated tags column with a recursive CTE so SQLite does
+# the counting rather than Python.
+_TAG_FREQUENCY_SQL = """
+    WITH RECURSIVE split(tag, rest) AS (
+        SELECT '', tags || ','
+        FROM meals
+        WHERE tags IS NOT NULL AND date >= ?
+        UNION ALL
+        SELECT
+            trim(substr(rest, 1, instr(rest, ',') - 1), char(32, 9, 10, 13)),
+            substr(rest, instr(rest, ',') + 1)
+        FROM split
+        WHERE rest != ''
+    )
+    SELECT tag, COUNT(*) FROM split WHERE tag != '' GROUP BY tag
+"""
+
+_STALE_MEALS_SQL = """
+    SELECT title, recipe_id, MAX(date) as last_date, COUNT(*) as times_cooked
+    FROM meals
+    WHERE date >= ? AND status IN ('cooked', 'planned')
+    GROUP BY COALESCE(recipe_id, title)
+    HAVING MAX(date) < ?
+    ORDER BY last_date ASC
+"""
+
+_FREQUENT_ADHOC_SQL = """
+    SELECT title, COUNT(*) as count
+    FROM meals
+    WHERE date >= ? AND status = 'cooked' AND recipe_id IS NULL
+    GROUP BY title
+    HAVING COUNT(*) >= ?
+    ORDER BY count DESC, MAX(date) DESC
+"""
 
 
 def get_tag_frequency(days: int = 90) -> dict[str, int]:
     """Return a dict of tag -> count over the given time window."""
     cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-    conn = get_connection()
-    try:
-        cursor = conn.execute(
-            "SELECT tags FROM meals WHERE tags IS NOT NULL AND date >= ?",
-            (cutoff,),
-        )
-        freq: dict[str, int] = {}
-        for row in cursor.fetchall():
-            for tag in row["tags"].split(","):
-                tag = tag.strip()
-                if tag:
-                    freq[tag] = freq.get(tag, 0) + 1
-        return freq
-    finally:
-        conn.close()
+    with borrow() as conn:
+        with closing(conn.execute(_TAG_FREQUENCY_SQL, (cutoff,))) as cursor:
+            return dict(cursor)
 
 
 def get_stale_meals(days: int = 90, min_gap: int = 30) -> list[dict]:
@@ -182,22 +315,44 @@ def get_stale_meals(days: int = 90, min_gap: int = 30) -> list[dict]:
     """
     window_start = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
     stale_cutoff = (datetime.now() - timedelta(days=min_gap)).strftime("%Y-%m-%d")
-    conn = get_connection()
-    try:
-        cursor = conn.execute(
-            """
-            SELECT title, recipe_id, MAX(date) as last_date, COUNT(*) as times_cooked
-            FROM meals
-            WHERE date >= ? AND status IN ('cooked', 'planned')
-            GROUP BY COALESCE(recipe_id, title)
-            HAVING MAX(date) < ?
-            ORDER BY last_date ASC
-            """,
-            (window_start, stale_cutoff),
-        )
-        return [dict(row) for row in cursor.fetchall()]
-    finally:
-        conn.close()
+    with borrow() as conn:
+        with closing(conn.execute(_STALE_MEALS_SQL, (window_start, stale_cutoff))) as cursor:
+            return fetch_dicts(cursor)
+
+
+def get_suggestion_stats(days: int = 90, min_gap: int = 30, min_adhoc: int = 3) -> dict:
+    """Gather the history used for meal suggestions in one read transaction.
+
+    Returns a dict with tag_frequency (tag -> count), stale_meals (as from
+    get_stale_meals) and frequent_adhoc (cooked meals without a recipe_id
+    seen at least min_adhoc times, most frequent first).
+    """
+    window_start = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+    stale_cutoff = (datetime.now() - timedelta(days=min_gap)).strftime("%Y-%m-%d")
+    tag_frequency, stale_meals, frequent_adhoc = _get_suggestion_stats(
+        window_start, stale_cutoff, min_adhoc, _data_version()
+    )
+    return {
+        "tag_frequency": dict(tag_frequency),
+        "stale_meals": [dict(row) for row in stale_meals],
+        "frequent_adhoc": [dict(row) for row in frequent_adhoc],
+    }
+
+
+@cache_per_version()
+def _get_suggestion_stats(
+    window_start: str, stale_cutoff: str, min_adhoc: int, version: tuple
+) -> tuple[tuple[tuple[str, int], ...], tuple[dict, ...], tuple[dict, ...]]:
+    with borrow() as conn:
+        conn.execute("BEGIN")
+        with closing(conn.execute(_TAG_FREQUENCY_SQL, (window_start,))) as cursor:
+            tag_frequency = tuple(cursor)
+        with closing(conn.execute(_STALE_MEALS_SQL, (window_start, stale_cutoff))) as cursor:
+            stale_meals = tuple(iter_dicts(cursor))
+        with closing(conn.execute(_FREQUENT_ADHOC_SQL, (window_start, min_adhoc))) as cursor:
+            frequent_adhoc = tuple(iter_dicts(cursor))
+        conn.commit()
+    return tag_frequency, stale_meals, frequent_adhoc
 
 
 init_db()
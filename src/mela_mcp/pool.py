@@ -0,0 +1,170 @@
+"""Thread-safe pool of long-lived SQLite connections and row helpers."""
+
+import functools
+import queue
+import sqlite3
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def file_version(path: Path) -> tuple:
+    """Return a token that changes whenever the database at path is written.
+
+    Covers the main file and its -wal file, so commits from any process,
+    not just this one, produce a new token.
+    """
+    stamps = []
+    for p in (path, path.with_name(path.name + "-wal")):
+        try:
+            stat = p.stat()
+        except FileNotFoundError:
+            stamps.append(None)
+        else:
+            stamps.append((stat.st_mtime_ns, stat.st_size))
+    return (str(path), *stamps)
+
+
+def cache_per_version(maxsize: int = 256):
+    """Cache results for the current data version only.
+
+    Works like ``functools.lru_cache`` on functions whose last argument is a
+    data-version token such as ``file_version()``. Entries cached under an older version can never be hit again, so the
+    whole cache is emptied as soon as a call arrives with a new version
+    rather than leaving the dead snapshots in memory until evicted.
+    """
+    def decorate(func):
+        cached = functools.lru_cache(maxsize=maxsize)(func)
+        lock = threading.Lock()
+        latest = None
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            nonlocal latest
+            with lock:
+                if args[-1] != latest:
+                    cached.cache_clear()
+                    latest = args[-1]
+            return cached(*args)
+
+        wrapper.cache_info = cached.cache_info
+        wrapper.cache_clear = cached.cache_clear
+        return wrapper
+
+    return decorate
+
+
+def fetch_dict(cursor: sqlite3.Cursor) -> dict | None:
+    """Fetch the next row as a dict keyed by column name, or None."""
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return dict(zip([col[0] for col in cursor.description], row))
+
+
+def iter_dicts(cursor: sqlite3.Cursor) -> Iterator[dict]:
+    """Yield the remaining rows as dicts keyed by column name.
+
+    Rows are stepped straight off the cursor, so no intermediate list of
+    tuples is built alongside the dicts.
+    """
+    cols = [col[0] for col in cursor.description]
+    for row in cursor:
+        yield dict(zip(cols, row))
+
+
+def fetch_dicts(cursor: sqlite3.Cursor) -> list[dict]:
+    """Fetch all remaining rows as dicts keyed by column name."""
+    return list(iter_dicts(cursor))
+
+
+class ConnectionPool:
+    """A bounded pool of SQLite connections opened lazily and reused.
+
+    Connections are created on first use by the ``connect`` callable, up to
+    ``size`` of them, and handed out one borrower at a time. If given,
+    ``on_close`` is called with each connection just before it is closed.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], sqlite3.Connection],
+        size: int = 4,
+        on_close: Callable[[sqlite3.Connection], None] | None = None,
+    ):
+        self._connect = connect
+        self._size = size
+        self._on_close = on_close
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue(maxsize=size)
+        self._opened = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> sqlite3.Connection:
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                can_open = self._opened < self._size
+                if can_open:
+                    self._opened += 1
+            if can_open:
+                break
+
+            # Wait briefly for a connection to be returned, then re-check in
+            # case a discarded connection freed up room to open a new one.
+            try:
+                return self._idle.get(timeout=0.05)
+            except queue.Empty:
+                continue
+
+        try:
+            return self._connect()
+        except BaseException:
+            with self._lock:
+                self._opened -= 1
+            raise
+
+    @contextmanager
+    def borrow(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection for the duration of a ``with`` block."""
+        generation = self._generation
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            if generation == self._generation:
+                self._idle.put(conn)
+            else:
+                self._discard(conn)
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            self._opened -= 1
+        try:
+            if self._on_close is not None:
+                self._on_close(conn)
+        except sqlite3.Error:
+            pass
+        finally:
+            conn.close()
+
+    def close_all(self) -> None:
+        """Close every connection so the next borrow opens fresh ones.
+
+        Connections currently borrowed are closed when they are returned.
+        """
+        with self._lock:
+            self._generation += 1
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
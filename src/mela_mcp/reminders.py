@@ -1,18 +1,51 @@
-"""AppleScript-based Apple Reminders integration for grocery lists."""
-
-import subprocess
-
-
-def run_applescript(script: str) -> str:
-    """Execute an AppleScript and return the output."""
-    result = subprocess.run(
-        ["osascript", "-e", script],
-        capture_output=True,
-        text=True
-    )
-    if result.returncode != 0:
-        raise RuntimeError(f"AppleScript error: {result.stderr}")
-    return result.stdout.strip()
+"""JXA-based Apple Reminders integration for grocery lists."""
+
+import json
+
+from .applescript_host import run_jxa
+
+_ADD_REMINDERS_JXA = r"""
+const app = Application('Reminders');
+let targetList = app.lists.byName(args.listName);
+try {
+    targetList.name();
+} catch (e) {
+    app.lists.push(app.List({name: args.listName}));
+    targetList = app.lists.byName(args.listName);
+}
+const reminders = targetList.reminders;
+args.items.forEach(item => reminders.push(app.Reminder({name: item})));
+return 'success';
+"""
+
+_CLEAR_REMINDERS_JXA = r"""
+const app = Application('Reminders');
+const targetList = app.lists.byName(args.listName);
+try {
+    targetList.name();
+} catch (e) {
+    return '0';
+}
+// Count and delete the matching reminders with one Apple Event each rather
+// than resolving and deleting them one by one.
+const incompleteItems = targetList.reminders.whose({completed: false});
+const itemCount = incompleteItems.length;
+if (itemCount > 0) {
+    incompleteItems.delete();
+}
+return String(itemCount);
+"""
+
+_GET_REMINDERS_JXA = r"""
+const app = Application('Reminders');
+const targetList = app.lists.byName(args.listName);
+try {
+    targetList.name();
+} catch (e) {
+    return '[]';
+}
+return JSON.stringify(targetList.reminders.whose({completed: false}).name());
+"""
 
 
 def add_reminders(items: list[str], list_name: str = "Grocery") -> dict:
@@ -25,27 +58,8 @@ def add_reminders(items: list[str], list_name: str = "Grocery") -> dict:
     Returns:
         Dict with success status and count of items added
     """
-    escaped_list = list_name.replace('"', '\\"')
-
-    reminder_lines = ""
-    for item in items:
-        escaped_item = item.replace('"', '\\"')
-        reminder_lines += f'        make new reminder at end of reminders of targetList with properties {{name:"{escaped_item}"}}\n'
-
-    script = f'''
-    tell application "Reminders"
-        try
-            set targetList to list "{escaped_list}"
-        on error
-            set targetList to make new list with properties {{name:"{escaped_list}"}}
-        end try
-{reminder_lines}
-    end tell
-    return "success"
-    '''
-
     try:
-        run_applescript(script)
+        run_jxa(_ADD_REMINDERS_JXA, listName=list_name, items=items)
         return {"success": True, "count": len(items), "list": list_name}
     except RuntimeError as e:
         return {"success": False, "error": str(e)}
@@ -60,26 +74,8 @@ def clear_reminders(list_name: str = "Grocery") -> dict:
     Returns:
         Dict with success status and count of items removed
     """
-    escaped_list = list_name.replace('"', '\\"')
-
-    script = f'''
-    tell application "Reminders"
-        try
-            set targetList to list "{escaped_list}"
-        on error
-            return "0"
-        end try
-        set incompleteItems to (every reminder of targetList whose completed is false)
-        set itemCount to count of incompleteItems
-        repeat with r in incompleteItems
-            delete r
-        end repeat
-        return itemCount as string
-    end tell
-    '''
-
     try:
-        result = run_applescript(script)
+        result = run_jxa(_CLEAR_REMINDERS_JXA, listName=list_name)
         count = int(result) if result else 0
         return {"success": True, "removed": count, "list": list_name}
     except RuntimeError as e:
@@ -95,29 +91,9 @@ def get_reminders(list_name: str = "Grocery") -> dict:
     Returns:
         Dict with success status and list of item names
     """
-    escaped_list = list_name.replace('"', '\\"')
-
-    script = f'''
-    tell application "Reminders"
-        try
-            set targetList to list "{escaped_list}"
-        on error
-            return ""
-        end try
-        set output to ""
-        set incompleteItems to (every reminder of targetList whose completed is false)
-        repeat with r in incompleteItems
-            set output to output & name of r & "|||"
-        end repeat
-        return output
-    end tell
-    '''
-
     try:
-        result = run_applescript(script)
-        items = []
-        if result:
-            items = [item for item in result.split("|||") if item]
+        result = run_jxa(_GET_REMINDERS_JXA, listName=list_name)
+        items = [item for item in json.loads(result or "[]") if item]
         return {"success": True, "items": items, "list": list_name}
     except RuntimeError as e:
         return {"success": False, "error": str(e), "items": []}
@@ -1,9 +1,13 @@
 """Mela MCP Server - Recipe database and meal scheduling integration."""
 
+import asyncio
+import functools
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 from mcp.server.fastmcp import FastMCP
+from pydantic import BaseModel, ConfigDict, Field
 
 from . import database
 from . import calendar
@@ -15,9 +19,28 @@ mcp = FastMCP("mela")
 CALENDAR_NAME = os.environ.get("MELA_CALENDAR_NAME", "Family")
 GROCERY_LIST = os.environ.get("MELA_GROCERY_LIST", "Groceries")
 
+# Blocking work runs off the event loop so tool calls can overlap. SQLite
+# and Calendar/Reminders calls get separate pools so a slow JXA round-trip
+# never starves a database query; the database pool matches the size of the
+# SQLite connection pools.
+_DB_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="mela-db")
+_OSA_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="mela-osa")
+
+
+async def _run_db(func, /, *args, **kwargs):
+    """Run a blocking database call on the database thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_DB_EXECUTOR, functools.partial(func, *args, **kwargs))
+
+
+async def _run_osa(func, /, *args, **kwargs):
+    """Run a blocking Calendar/Reminders call on the automation thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_OSA_EXECUTOR, functools.partial(func, *args, **kwargs))
+
 
 @mcp.tool()
-def search_recipes(query: str) -> list[dict]:
+async def search_recipes(query: str) -> list[dict]:
     """Search recipes by name or ingredients.
 
     Args:
@@ -26,11 +49,11 @@ def search_recipes(query: str) -> list[dict]:
     Returns:
         List of matching recipes with id, title, prep_time, cook_time, total_time
     """
-    return database.search_recipes(query)
+    return await _run_db(database.search_recipes, query)
 
 
 @mcp.tool()
-def get_recipe(recipe_id: int) -> dict | None:
+async def get_recipe(recipe_id: int) -> dict | None:
     """Get full details for a specific recipe.
 
     Args:
@@ -40,11 +63,11 @@ def get_recipe(recipe_id: int) -> dict | None:
         Full recipe details including title, ingredients, instructions, notes,
         nutrition, yield, times, favorite status, want_to_cook status, and link
     """
-    return database.get_recipe(recipe_id)
+    return await _run_db(database.get_recipe, recipe_id)
 
 
 @mcp.tool()
-def list_recipes(filter: str = "all") -> list[dict]:
+async def list_recipes(filter: str = "all") -> list[dict]:
     """List all recipes with optional filter.
 
     Args:
@@ -53,11 +76,11 @@ def list_recipes(filter: str = "all") -> list[dict]:
     Returns:
         List of recipes with id, title, favorite, want_to_cook
     """
-    return database.list_recipes(filter)
+    return await _run_db(database.list_recipes, filter)
 
 
 @mcp.tool()
-def get_scheduled_meals(days: int = 7, past_days: int = 0) -> list[dict]:
+async def get_scheduled_meals(days: int = 7, past_days: int = 0) -> list[dict]:
     """Get meals scheduled from the calendar, including past and future dates.
 
     Args:
@@ -68,11 +91,11 @@ def get_scheduled_meals(days: int = 7, past_days: int = 0) -> list[dict]:
     Returns:
         List of scheduled meals with title, date, time
     """
-    return calendar.get_scheduled_meals(CALENDAR_NAME, days, past_days)
+    return await _run_osa(calendar.get_scheduled_meals, CALENDAR_NAME, days, past_days)
 
 
 @mcp.tool()
-def schedule_meal(recipe_name: str, date: str, time: str = "18:00") -> dict:
+async def schedule_meal(recipe_name: str, date: str, time: str = "18:00") -> dict:
     """Schedule a meal on the calendar.
 
     Args:
@@ -83,27 +106,29 @@ def schedule_meal(recipe_name: str, date: str, time: str = "18:00") -> dict:
     Returns:
         Dict with success status and event details
     """
-    recipe_id = None
-    recipe_zid = None
-    matches = database.search_recipes(recipe_name)
-    for m in matches:
-        if m["title"].lower() == recipe_name.lower():
-            recipe_id = m["id"]
-            recipe_zid = database.get_recipe_zid(recipe_id)
-            break
-    result = calendar.schedule_meal(CALENDAR_NAME, recipe_name, date, time, recipe_zid=recipe_zid)
+    # The event's deep link needs the recipe's ZID, so only the calendar
+    # backend startup can overlap with the recipe lookup.
+    recipe, _ = await asyncio.gather(
+        _run_db(database.find_recipe_by_title, recipe_name),
+        _run_osa(calendar.start),
+    )
+    recipe_zid = recipe["zid"] if recipe else None
+    result = await _run_osa(
+        calendar.schedule_meal, CALENDAR_NAME, recipe_name, date, time, recipe_zid=recipe_zid
+    )
     if result.get("success"):
-        meal_log.log_meal(
+        await _run_db(
+            meal_log.log_meal,
             date=date,
             title=recipe_name,
-            recipe_id=recipe_id,
+            recipe_id=recipe["id"] if recipe else None,
             status="planned",
         )
     return result
 
 
 @mcp.tool()
-def log_meal(
+async def log_meal(
     title: str,
     date: str | None = None,
     tags: str | None = None,
@@ -126,7 +151,8 @@ def log_meal(
     """
     if date is None:
         date = datetime.now().strftime("%Y-%m-%d")
-    return meal_log.log_meal(
+    return await _run_db(
+        meal_log.log_meal,
         date=date,
         title=title,
         recipe_id=recipe_id,
@@ -137,8 +163,38 @@ def log_meal(
     )
 
 
+class MealEntry(BaseModel):
+    """A cooked or eaten meal for log_meals; fields mirror log_meal."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    title: str = Field(description="Name of the meal")
+    date: str | None = Field(None, description="Date in YYYY-MM-DD format (defaults to today)")
+    tags: str | None = Field(None, description='Comma-separated tags (e.g. "quick,vegetarian")')
+    recipe_id: int | None = Field(None, description="Optional Mela recipe ID to link")
+    portions: int | None = Field(None, description="Number of portions made")
+    notes: str | None = Field(None, description="Any notes about the meal")
+
+
 @mcp.tool()
-def update_meal_log(
+async def log_meals(meals: list[MealEntry]) -> list[dict]:
+    """Log several cooked or eaten meals at once, e.g. to catch up on a week.
+
+    Args:
+        meals: Meals to log, each with the same fields as log_meal
+
+    Returns:
+        The created meal log entries
+    """
+    today = datetime.now().strftime("%Y-%m-%d")
+    return await _run_db(meal_log.log_meals_bulk, [
+        {**m.model_dump(), "date": m.date or today, "status": "cooked"}
+        for m in meals
+    ])
+
+
+@mcp.tool()
+async def update_meal_log(
     meal_id: int,
     status: str | None = None,
     notes: str | None = None,
@@ -155,11 +211,11 @@ def update_meal_log(
     Returns:
         The updated meal log entry
     """
-    return meal_log.update_meal(meal_id, status=status, notes=notes, tags=tags)
+    return await _run_db(meal_log.update_meal, meal_id, status=status, notes=notes, tags=tags)
 
 
 @mcp.tool()
-def get_meal_history(
+async def get_meal_history(
     days: int = 30,
     tags: str | None = None,
     status: str | None = None,
@@ -176,7 +232,8 @@ def get_meal_history(
     """
     start_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
     end_date = datetime.now().strftime("%Y-%m-%d")
-    return meal_log.get_meals(
+    return await _run_db(
+        meal_log.get_meals,
         start_date=start_date,
         end_date=end_date,
         status=status,
@@ -185,7 +242,7 @@ def get_meal_history(
 
 
 @mcp.tool()
-def review_recent_meals(days: int = 7) -> list[dict]:
+async def review_recent_meals(days: int = 7) -> list[dict]:
     """Review recently planned meals that haven't been marked as cooked or skipped.
 
     Args:
@@ -194,11 +251,11 @@ def review_recent_meals(days: int = 7) -> list[dict]:
     Returns:
         List of unreconciled planned meals
     """
-    return meal_log.get_unreconciled(days=days)
+    return await _run_db(meal_log.get_unreconciled, days=days)
 
 
 @mcp.tool()
-def get_meal_suggestions(days_back: int = 90) -> dict:
+async def get_meal_suggestions(days_back: int = 90) -> dict:
     """Get meal suggestions based on cooking history.
 
     Analyzes tag frequency and identifies meals that haven't been cooked recently
@@ -211,27 +268,23 @@ def get_meal_suggestions(days_back: int = 90) -> dict:
         Dict with novelty_candidates (stale meals), tag_frequency, and
         frequent_adhoc (meals without a recipe_id cooked 3+ times)
     """
-    tag_freq = meal_log.get_tag_frequency(days=days_back)
-    stale = meal_log.get_stale_meals(days=days_back, min_gap=30)
-
-    # Find frequent ad-hoc meals (no recipe_id, cooked 3+ times)
-    all_meals = meal_log.get_meals(
-        start_date=(datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d"),
-    )
-    adhoc_counts: dict[str, int] = {}
-    for m in all_meals:
-        if m.get("recipe_id") is None and m.get("status") == "cooked":
-            adhoc_counts[m["title"]] = adhoc_counts.get(m["title"], 0) + 1
-    frequent_adhoc = [
-        {"title": title, "count": count}
-        for title, count in sorted(adhoc_counts.items(), key=lambda x: -x[1])
-        if count >= 3
-    ]
-
-    # Compute over/under-represented tags relative to average
-    avg = sum(tag_freq.values()) / len(tag_freq) if tag_freq else 0
-    over_tags = {t: c for t, c in tag_freq.items() if c > avg * 1.5} if avg else {}
-    under_tags = {t: c for t, c in tag_freq.items() if c < avg * 0.5} if avg else {}
+    stats = await _run_db(meal_log.get_suggestion_stats, days=days_back, min_gap=30)
+    tag_freq = stats["tag_frequency"]
+    stale = stats["stale_meals"]
+    frequent_adhoc = stats["frequent_adhoc"]
+
+    # Classify tags as over/under-represented relative to the average in a
+    # single pass over the counts
+    over_tags: dict[str, int] = {}
+    under_tags: dict[str, int] = {}
+    if tag_freq:
+        avg = sum(tag_freq.values()) / len(tag_freq)
+        over_limit, under_limit = avg * 1.5, avg * 0.5
+        for tag, count in tag_freq.items():
+            if count > over_limit:
+                over_tags[tag] = count
+            elif count < under_limit:
+                under_tags[tag] = count
 
     return {
         "novelty_candidates": stale,
@@ -243,7 +296,7 @@ def get_meal_suggestions(days_back: int = 90) -> dict:
 
 
 @mcp.tool()
-def get_scheduled_ingredients(days: int = 7) -> list[dict]:
+async def get_scheduled_ingredients(days: int = 7) -> list[dict]:
     """Get raw ingredients for meals scheduled on the calendar.
 
     Matches calendar event titles to Mela recipes and returns their
@@ -257,12 +310,12 @@ def get_scheduled_ingredients(days: int = 7) -> list[dict]:
         (raw text), and matched status (True, "fuzzy", or False).
         Ingredients is None for meals with no matching recipe.
     """
-    meals = calendar.get_scheduled_meals(CALENDAR_NAME, days)
+    meals = await _run_osa(calendar.get_scheduled_meals, CALENDAR_NAME, days)
     titles = [m["title"] for m in meals]
     if not titles:
         return []
 
-    ingredient_data = database.get_ingredients_for_scheduled_meals(titles)
+    ingredient_data = await _run_db(database.get_ingredients_for_scheduled_meals, titles)
     ingredient_map = {item["title"]: item for item in ingredient_data}
 
     results = []
@@ -279,7 +332,7 @@ def get_scheduled_ingredients(days: int = 7) -> list[dict]:
 
 
 @mcp.tool()
-def add_grocery_items(items: list[str], list_name: str = GROCERY_LIST) -> dict:
+async def add_grocery_items(items: list[str], list_name: str = GROCERY_LIST) -> dict:
     """Add items to the grocery list in Apple Reminders.
 
     Args:
@@ -289,11 +342,11 @@ def add_grocery_items(items: list[str], list_name: str = GROCERY_LIST) -> dict:
     Returns:
         Dict with success status and count of items added
     """
-    return reminders.add_reminders(items, list_name)
+    return await _run_osa(reminders.add_reminders, items, list_name)
 
 
 @mcp.tool()
-def clear_grocery_list(list_name: str = GROCERY_LIST) -> dict:
+async def clear_grocery_list(list_name: str = GROCERY_LIST) -> dict:
     """Clear all incomplete items from the grocery list in Apple Reminders.
 
     Use this before repopulating with a fresh grocery list.
@@ -304,11 +357,11 @@ def clear_grocery_list(list_name: str = GROCERY_LIST) -> dict:
     Returns:
         Dict with success status and count of items removed
     """
-    return reminders.clear_reminders(list_name)
+    return await _run_osa(reminders.clear_reminders, list_name)
 
 
 @mcp.tool()
-def get_grocery_list(list_name: str = GROCERY_LIST) -> dict:
+async def get_grocery_list(list_name: str = GROCERY_LIST) -> dict:
     """Get the current grocery list from Apple Reminders.
 
     Returns all incomplete (unchecked) items from the list.
@@ -319,11 +372,12 @@ def get_grocery_list(list_name: str = GROCERY_LIST) -> dict:
     Returns:
         Dict with success status and list of item names
     """
-    return reminders.get_reminders(list_name)
+    return await _run_osa(reminders.get_reminders, list_name)
 
 
 def main():
     """Run the MCP server."""
+    database.warm_cache()
     mcp.run(transport="stdio")
 
 